@@ -98,4 +98,5 @@ class BadgesEventMeta(EventMetaBase, CountBadgesMixin):
         if self.is_user_admin(user):
             return True
 
+        # cached on the user object, see GroupManagementMixin.is_user_in_group
         return self.onboarding_access_group and self.is_user_in_group(user, self.onboarding_access_group)
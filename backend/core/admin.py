@@ -50,6 +50,7 @@ class PersonAdmin(admin.ModelAdmin):
 
     list_display = ("surname", "first_name", "nick", "email", "phone", "username")
     search_fields = ("surname", "first_name", "nick", "email", "user__username")
+    list_select_related = ("user",)
     ordering = ("surname", "first_name", "nick")
     actions = [merge_selected_people]
 
@@ -59,6 +60,8 @@ class EventAdmin(admin.ModelAdmin):
     list_display = ("name", "organization", "venue", "public", "cancelled")
     list_filter = ("organization", "venue", "public", "cancelled")
     search_fields = ("name",)
+    list_select_related = ("organization", "venue")
+    autocomplete_fields = ("venue",)
 
     inlines = (
         InlineLabourEventMetaAdmin,
@@ -133,7 +136,12 @@ class MyGroupAdmin(GroupAdmin):
         return GroupForm
 
 
-admin.site.register(Venue)
+@admin.register(Venue)
+class VenueAdmin(admin.ModelAdmin):
+    list_display = ("name",)
+    search_fields = ("name",)
+
+
 admin.site.register(CarouselSlide)
 
 
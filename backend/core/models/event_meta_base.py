@@ -30,6 +30,8 @@ class EventMetaBase(models.Model, GroupManagementMixin):
         """
         Bridge between legacy access control and CBAC. Users that can do anything in an event are considered
         admins of that event.
+
+        Without CBAC, group membership is cached on the user object (see is_user_in_group).
         """
         if self.use_cbac:
             from access.models.cbac_entry import CBACEntry
@@ -9,12 +9,20 @@ class GroupManagementMixin:
         if not user.is_authenticated:
             return False
 
-        return user.groups.filter(pk=group.pk).exists()
+        # Like the permission caches of ModelBackend, the group ids are cached on the user object,
+        # which usually lives for the duration of a request. Membership changes made after the
+        # first check are not seen through the same user object unless they go through
+        # ensure_user_is_member_of_group or the like, which call forget_user_group_ids.
+        if not hasattr(user, "_group_ids_cache"):
+            user._group_ids_cache = set(user.groups.values_list("id", flat=True))
+
+        return group.pk in user._group_ids_cache
 
     def is_user_in_admin_group(self, user):
         return self.is_user_in_group(user, self.admin_group)
 
     # DEPRECATED: Once all applications have moved to CBAC, remove this
+    # NOTE: Group membership is cached on the user object, see is_user_in_group.
     def is_user_admin(self, user):
         return user.is_superuser or self.is_user_in_admin_group(user)
 
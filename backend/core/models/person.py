@@ -16,7 +16,7 @@ from django.utils import timezone
 from django.utils.timezone import now
 from django.utils.translation import gettext_lazy as _
 
-from ..utils import calculate_age, format_phone_number, phone_number_validator, pick_attrs
+from ..utils import calculate_age, forget_user_group_ids, format_phone_number, phone_number_validator, pick_attrs
 from .constants import (
     BIRTH_DATE_HELP_TEXT,
     EMAIL_LENGTH,
@@ -492,6 +492,7 @@ class Person(models.Model):
             raise AssertionError("self.user")
         for group_name in settings.KOMPASSI_NEW_USER_GROUPS:
             self.user.groups.add(Group.objects.get(name=group_name))
+        forget_user_group_ids(self.user)
 
     def apply_state_new_user(self, request, password):
         self.setup_email_verification(request)
@@ -7,7 +7,7 @@ from django.utils.timezone import get_current_timezone
 
 from core.utils.time_utils import format_date_range
 
-from .utils import format_interval, full_hours_between, slugify
+from .utils import ensure_user_is_member_of_group, format_interval, full_hours_between, slugify
 
 
 class PersonTestCase(TestCase):
@@ -21,6 +21,35 @@ class PersonTestCase(TestCase):
         assert p.normalized_phone_number == "ööää"
 
 
+class GroupManagementMixinTestCase(TestCase):
+    def test_is_user_in_group_cached(self):
+        from django.contrib.auth.models import Group, User
+
+        from core.models.group_management_mixin import GroupManagementMixin
+
+        user = User.objects.create(username="test-group-membership")
+        group = Group.objects.create(name="test-group-membership")
+        other_group = Group.objects.create(name="test-group-membership-other")
+
+        # one query for all checks through the same user object
+        with self.assertNumQueries(1):
+            assert not GroupManagementMixin.is_user_in_group(user, group)
+            assert not GroupManagementMixin.is_user_in_group(user, other_group)
+
+        # changes made behind the back of the user object are not seen through it
+        group.user_set.add(user)
+        assert not GroupManagementMixin.is_user_in_group(user, group)
+        assert GroupManagementMixin.is_user_in_group(User.objects.get(pk=user.pk), group)
+
+        # the membership helpers drop the cache
+        ensure_user_is_member_of_group(user, other_group)
+        assert GroupManagementMixin.is_user_in_group(user, group)
+        assert GroupManagementMixin.is_user_in_group(user, other_group)
+
+        ensure_user_is_member_of_group(user, group, False)
+        assert not GroupManagementMixin.is_user_in_group(user, group)
+
+
 class UtilsTestCase(TestCase):
     def test_full_hours_between(self):
         tz = tzlocal()
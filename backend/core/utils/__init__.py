@@ -18,6 +18,7 @@ from .misc_utils import (
     ensure_groups_exist,
     ensure_user_group_membership,
     ensure_user_is_member_of_group,
+    forget_user_group_ids,
     get_code,
     get_ip,
     give_all_app_perms_to_group,
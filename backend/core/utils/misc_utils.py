@@ -36,6 +36,8 @@ def ensure_user_group_membership(user, groups_to_add=None, groups_to_remove=None
     for group in groups_to_remove:
         group.user_set.remove(user)
 
+    forget_user_group_ids(user)
+
 
 def ensure_user_is_member_of_group(user, group, should_belong_to_group=True):
     if isinstance(group, str):
@@ -50,6 +52,16 @@ def ensure_user_is_member_of_group(user, group, should_belong_to_group=True):
     else:
         group.user_set.remove(user)  # type: ignore
 
+    forget_user_group_ids(user)
+
+
+def forget_user_group_ids(user):
+    """
+    Drops the group ids that GroupManagementMixin.is_user_in_group caches on the user object,
+    so that membership changes made through the same user object are seen by later checks.
+    """
+    user.__dict__.pop("_group_ids_cache", None)
+
 
 def ensure_groups_exist(group_names):
     return [Group.objects.get_or_create(name=group_name)[0] for group_name in group_names]
@@ -1,3 +1,4 @@
+from django import forms
 from django.conf import settings
 from django.contrib import admin
 from django.urls import reverse
@@ -14,11 +15,27 @@ class ProjectAdmin(admin.ModelAdmin):
         return reverse("emprinten_index", kwargs={"event": obj.event.slug, "slug": obj.slug})
 
 
-admin.site.register(models.FileVersion)
+class FileVersionAdminForm(forms.ModelForm):
+    class Meta:
+        model = models.FileVersion
+        fields = "__all__"
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        # The renderer caches file contents by the stored file name, so the data of a saved version
+        # must not be replaced in place (storage may reuse the name). Upload a new version instead.
+        if self.instance.pk is not None:
+            self.fields["data"].disabled = True
+
+
+@admin.register(models.FileVersion)
+class FileVersionAdmin(admin.ModelAdmin):
+    form = FileVersionAdminForm
 
 
 class FileVersionInline(admin.TabularInline):
     model = models.FileVersion
+    form = FileVersionAdminForm
     ordering = ("version",)
 
 
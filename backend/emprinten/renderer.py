@@ -1,7 +1,12 @@
 import collections.abc
+import concurrent.futures
 import contextlib
+import contextvars
+import dataclasses
 import functools
 import html
+import io
+import multiprocessing
 import os
 import shutil
 import tempfile
@@ -11,8 +16,8 @@ import zipfile
 
 import jinja2.nodes
 import weasyprint
+from django.conf import settings
 from django.http import FileResponse, HttpResponse, HttpResponseBase
-from jinja2 import FunctionLoader
 from jinja2.sandbox import SandboxedEnvironment
 
 from . import filters, functions
@@ -22,9 +27,11 @@ from .models import FileVersion, ProjectFile
 DEBUG = False
 
 FileWithData = tuple[str, dict[str, str | dict[str, typing.Any]] | None, bool]
+PdfWithData = tuple[str, bytes, dict[str, str | dict[str, typing.Any]] | None, bool]
 DataRow = dict[str, str | dict[str, typing.Any]]
 DataSet = list[DataRow]
 Vfs = dict[str, FileVersion]
+FileContents = dict[str, bytes]
 
 LOCAL_FILE_URI_PREFIX = "file:///"
 RENDER_FAILURE_FILE_NAME_PATTERN = "ERROR-{}"
@@ -54,21 +61,89 @@ def files_to_vfs(files: typing.Iterable[FileVersion]) -> Vfs:
     return {file_version.file.file_name: file_version for file_version in files}
 
 
-def find_main(files: typing.Iterable[FileVersion]) -> FileVersion | None:
+class ProjectFiles(typing.NamedTuple):
+    main: FileVersion | None
+    vfs: Vfs
+    lookup_tables: list[FileVersion]
+    stylesheets: list[FileVersion]
+
+
+def partition_files(files: typing.Iterable[FileVersion]) -> ProjectFiles:
+    """
+    Sort the files of a project by their use in a single pass over `files`.
+    """
+    main: FileVersion | None = None
+    vfs: Vfs = {}
+    by_type: dict[str, list[FileVersion]] = {
+        ProjectFile.Type.CSV: [],
+        ProjectFile.Type.CSS: [],
+    }
     for file_version in files:
-        if file_version.file.type == ProjectFile.Type.Main:
-            return file_version
-    return None
+        vfs[file_version.file.file_name] = file_version
+        file_type = file_version.file.type
+        if file_type == ProjectFile.Type.Main:
+            if main is None:
+                main = file_version
+        elif (of_type := by_type.get(file_type)) is not None:
+            of_type.append(file_version)
+
+    return ProjectFiles(
+        main=main,
+        vfs=vfs,
+        lookup_tables=by_type[ProjectFile.Type.CSV],
+        stylesheets=by_type[ProjectFile.Type.CSS],
+    )
 
 
-def find_lookup_tables(files: typing.Iterable[FileVersion]) -> dict[str, Lut]:
+def find_lookup_tables(lookup_tables: typing.Iterable[FileVersion]) -> dict[str, Lut]:
     return {
-        make_name(os.path.splitext(file_version.file.file_name)[0]): make_lut(file_version.data, "utf-8")
-        for file_version in files
-        if file_version.file.type == ProjectFile.Type.CSV
+        make_name(os.path.splitext(file_version.file.file_name)[0]): _load_lut(_StoredFile.of(file_version))
+        for file_version in lookup_tables
     }
 
 
+@dataclasses.dataclass(frozen=True)
+class _StoredFile:
+    """
+    Cache key for what is read or parsed from the data of a FileVersion.
+
+    The stored file name is part of the key, so that data replaced on an existing FileVersion
+    is not served from the caches. (The admin does not allow replacing it, though.)
+    """
+
+    pk: int
+    name: str
+    file_version: FileVersion = dataclasses.field(compare=False, repr=False)
+
+    @classmethod
+    def of(cls, file_version: FileVersion) -> "_StoredFile":
+        return cls(file_version.pk, file_version.data.name, file_version)
+
+
+def _read_file(file_version: FileVersion) -> bytes:
+    if file_version.file.type == ProjectFile.Type.Image:
+        # Images may be large, so they are not kept in memory between renders.
+        return _read_data(file_version)
+    return _read_stored_file(_StoredFile.of(file_version))
+
+
+def _read_data(file_version: FileVersion) -> bytes:
+    with file_version.data.open("rb") as f:
+        return f.read()
+
+
+# Templates, stylesheets and lookup tables are small, so they are fetched from storage only once.
+@functools.lru_cache(maxsize=128)
+def _read_stored_file(stored_file: _StoredFile) -> bytes:
+    return _read_data(stored_file.file_version)
+
+
+# Templates cannot mutate the lookup tables, so the parsed tables can be shared between renders.
+@functools.lru_cache(maxsize=32)
+def _load_lut(stored_file: _StoredFile) -> Lut:
+    return make_lut(stored_file.file_version.data, "utf-8")
+
+
 @contextlib.contextmanager
 def make_temp_dir(*, keep: bool) -> collections.abc.Generator[str, None, None]:
     tmp_dir = tempfile.mkdtemp()
@@ -88,11 +163,12 @@ def render_pdf(
     return_archive: bool = False,
     handle_errors: bool = False,
 ) -> HttpResponseBase:
-    main = find_main(files)
+    project_files = partition_files(files)
+    main = project_files.main
     if main is None:
         return HttpResponse("Main file not found", status=404)
 
-    vfs = files_to_vfs(files)
+    vfs = project_files.vfs
     env = _TemplateCompiler(vfs, handle_errors)
     if DEBUG:
         print(vfs)
@@ -100,63 +176,61 @@ def render_pdf(
     if DEBUG:
         print(data)
 
-    with make_temp_dir(keep=False) as tmpdir:
+    with env.activate(), make_temp_dir(keep=False) as tmpdir:
         # tmpdir contents in the end (S for single file output, A for archive/split output):
         # - src/
         #   - master.html (S)
         #   - 001.html (A)
         #   - 002.html ...
-        # - result/
-        #   - master.pdf (S)
-        #   - 001.pdf (A)
-        #   - 002.pdf ...
-        # - result.zip (A)
 
-        # Either result/master.pdf or result.zip is streamed out.
+        # Rendered PDFs are kept in memory. Either master.pdf or an archive of them is streamed out.
         # master.pdf (S) is renamed when streamed.
-        # ???.pdf (A) are renamed when written into the zip.
+        # ???.pdf (A) are renamed when written into the archive.
 
         src_dir = os.path.join(tmpdir, "src")
-        result_dir = os.path.join(tmpdir, "result")
         os.mkdir(src_dir)
-        os.mkdir(result_dir)
 
         # Compile source templates into one or more html's into $tmpdir/src.
         sources: list[FileWithData] = env.compile(
-            main.file.file_name, src_dir, data, title_pattern, split_output=return_archive
+            main.file.file_name,
+            src_dir,
+            data,
+            title_pattern,
+            find_lookup_tables(project_files.lookup_tables),
+            split_output=return_archive,
         )
 
-        wp = _HtmlCompiler(vfs)
-        results: list[FileWithData] = wp.compile(sources, result_dir)
+        wp = _HtmlCompiler(vfs, project_files.stylesheets)
+        results: list[PdfWithData] = wp.compile(sources)
         name_tpl = env.from_string(filename_pattern) if filename_pattern else None
         name_factory = NameFactory(name_tpl)
 
         if return_archive:
-            z_name = os.path.join(tmpdir, "result.zip")
-            with zipfile.ZipFile(z_name, "w") as z:
-                for pdf_name, row, success in results:
+            archive = io.BytesIO()
+            # PDFs are compressed internally already, deflating them again would only burn CPU.
+            with zipfile.ZipFile(archive, "w", compression=zipfile.ZIP_STORED) as z:
+                for pdf_name, pdf, row, success in results:
                     post_format = "{}" if success else RENDER_FAILURE_FILE_NAME_PATTERN
                     arc_name = name_factory.make(
                         {"row": row},
-                        fallback=os.path.basename(pdf_name),
+                        fallback=pdf_name,
                         post_format=post_format,
                     )
-                    z.write(pdf_name, arcname=arc_name)
+                    z.writestr(arc_name, pdf)
             if DEBUG:
                 ls_r(tmpdir)
-            # FileResponse closes the open file by itself.
-            return FileResponse(open(z_name, "rb"), content_type="application/zip")  # noqa: SIM115
+            archive.seek(0)
+            return FileResponse(archive, content_type="application/zip")
 
         if len(results) > 1:
             return HttpResponse(status=401)
 
         if results:
-            pdf_name, row, success = results[0]
+            _, pdf, row, success = results[0]
             post_format = "{}" if success else RENDER_FAILURE_FILE_NAME_PATTERN
             file_name = name_factory.make({"row": row}, fallback="result.pdf", post_format=post_format)
-            # FileResponse closes the open file by itself.
             return FileResponse(
-                open(pdf_name, "rb"),  # noqa: SIM115
+                io.BytesIO(pdf),
                 content_type="application/pdf",
                 filename=file_name,
             )
@@ -197,57 +271,61 @@ class _TemplateCompiler:
     def __init__(self, vfs: Vfs, handle_errors: bool) -> None:
         self.vfs = vfs
         self.handle_errors = handle_errors
-
-        env = self.Environment(
-            autoescape=True,
-            loader=FunctionLoader(self._do_lookup),
-        )
-        # Mark some default global functions as safe.
-        for name in ("cycler", "dict", "joiner", "lipsum", "range"):
-            fn = env.globals.get(name)
-            if fn is not None:
-                env.globals[name] = self.wrap_as_safe_call(fn)
-
-        filters.add_all_to(env.filters)
-        env.globals.update({k: self.wrap_as_safe_call(v) for k, v in functions.get().items()})
-
-        self.env = env
+        self.env = _get_environment()
+
+    @contextlib.contextmanager
+    def activate(self) -> collections.abc.Generator[None, None, None]:
+        """
+        Make the vfs of this compiler visible to the shared environment's template loader.
+        """
+        token = _current_vfs.set(self.vfs)
+        try:
+            yield
+        finally:
+            _current_vfs.reset(token)
 
     def from_string(self, s: str | None) -> jinja2.Template | None:
         if s is None:
             return None
-        return self.env.from_string(s)
+        return _compile_string(s)
 
     def get_source(self, file_name: str) -> str:
-        return self.env.loader.get_source(self.env, file_name)[0]  # pyright: ignore reportOptionalMemberAccess
+        with self.activate():
+            return self.env.loader.get_source(self.env, file_name)[0]  # pyright: ignore reportOptionalMemberAccess
 
     def parse(self, source: str, **kwargs) -> jinja2.nodes.Template:
         return self.env.parse(source, **kwargs)
 
     def compile(
-        self, main_file_name: str, src_dir: str, data: DataSet, title_pattern: str, *, split_output: bool
+        self,
+        main_file_name: str,
+        src_dir: str,
+        data: DataSet,
+        title_pattern: str,
+        lookups: dict[str, Lut],
+        *,
+        split_output: bool,
     ) -> list[FileWithData]:
-        lookups = find_lookup_tables(self.vfs.values())
         tpl = self.env.get_template(main_file_name)
-        _title_pattern = self.env.from_string(title_pattern)
+        _title_pattern = _compile_string(title_pattern)
 
         sources: list[FileWithData] = []
         if split_output:
+            # The sandbox does not allow templates to mutate the row, so it can be passed around as-is.
             for idx, row in enumerate(data, start=1):
-                row_copy = dict(row)
-                title = _title_pattern.render(row=row_copy)
+                title = _title_pattern.render(row=row)
 
                 src_name = os.path.join(src_dir, f"{idx:03d}.html")
 
                 with open(src_name, "w") as of:
                     of.write(html_header(title=title))
-                    success = self._write_render_or_error(of, tpl, row_copy, idx, lookups)
+                    success = self._write_render_or_error(of, tpl, row, idx, lookups)
                     of.write(html_footer())
-                sources.append((src_name, row_copy, success))
+                sources.append((src_name, row, success))
         else:
             # Render title if we have any data, but supply the row only if it is singular.
-            row_copy = dict(data[0]) if len(data) == 1 else None
-            title = _title_pattern.render(row=row_copy) if data else ""
+            single_row = data[0] if len(data) == 1 else None
+            title = _title_pattern.render(row=single_row) if data else ""
 
             src_name = os.path.join(src_dir, "master.html")
 
@@ -255,9 +333,9 @@ class _TemplateCompiler:
             with open(src_name, "w") as of:
                 of.write(html_header(title=title))
                 for idx, row in enumerate(data, start=1):
-                    success &= self._write_render_or_error(of, tpl, dict(row), idx, lookups)
+                    success &= self._write_render_or_error(of, tpl, row, idx, lookups)
                 of.write(html_footer())
-            sources.append((src_name, row_copy, success))
+            sources.append((src_name, single_row, success))
         return sources
 
     def _write_render_or_error(self, of, tpl: jinja2.Template, row: dict, idx: int, lookups: dict) -> bool:
@@ -275,94 +353,173 @@ class _TemplateCompiler:
                 return False
             raise
 
-    # See `jinja2.loaders.FunctionLoader.__init__` for function signature.
-    def _do_lookup(
+
+# Files of the project currently being rendered. Set by `_TemplateCompiler.activate`.
+_current_vfs: contextvars.ContextVar[Vfs] = contextvars.ContextVar("emprinten_vfs")
+
+
+class _VfsLoader(jinja2.BaseLoader):
+    """
+    Template loader reading from the vfs of the active `_TemplateCompiler`.
+
+    The environment and its template cache are shared between projects, so a cached template
+    is considered up to date only while the active vfs still maps its name to the same stored file.
+    """
+
+    def get_source(
         self,
-        name: str,
-    ) -> tuple[str, str, typing.Callable[[], bool]] | None:
-        the_file: FileVersion | None = self.vfs.get(name)
+        environment: jinja2.Environment,
+        template: str,
+    ) -> tuple[str, str, typing.Callable[[], bool]]:
+        the_file: FileVersion | None = _current_vfs.get({}).get(template)
         if DEBUG:
-            print("Template lookup", name, the_file)
-        if the_file is None:
-            return None
-        if the_file.file.type not in (
+            print("Template lookup", template, the_file)
+        if the_file is None or the_file.file.type not in (
             ProjectFile.Type.Main,
             ProjectFile.Type.HTML,
             ProjectFile.Type.CSS,
         ):
-            return None
-        with the_file.data.open("rt") as tpl_file:
-            src = tpl_file.read()
-        return src, name, lambda: True
+            raise jinja2.TemplateNotFound(template)
+        src = _read_file(the_file).decode("utf-8")
+
+        stored_file = _StoredFile.of(the_file)
+
+        def uptodate() -> bool:
+            current = _current_vfs.get({}).get(template)
+            return current is not None and _StoredFile.of(current) == stored_file
+
+        return src, template, uptodate
+
+
+@functools.cache
+def _get_environment() -> _TemplateCompiler.Environment:
+    env = _TemplateCompiler.Environment(
+        autoescape=True,
+        loader=_VfsLoader(),
+        bytecode_cache=jinja2.FileSystemBytecodeCache(),
+    )
+    # Mark some default global functions as safe.
+    for name in ("cycler", "dict", "joiner", "lipsum", "range"):
+        fn = env.globals.get(name)
+        if fn is not None:
+            env.globals[name] = _TemplateCompiler.wrap_as_safe_call(fn)
+
+    filters.add_all_to(env.filters)
+    env.globals.update({k: _TemplateCompiler.wrap_as_safe_call(v) for k, v in functions.get().items()})
+    return env
+
+
+# Title and file name patterns are short strings repeated for every render of a project.
+# The environment is shared, so the source alone identifies the compiled template.
+@functools.lru_cache(maxsize=256)
+def _compile_string(source: str) -> jinja2.Template:
+    return _get_environment().from_string(source)
 
 
 class _HtmlCompiler:
-    def __init__(self, vfs: Vfs) -> None:
-        self.vfs = vfs
-        self.stylesheets = self.find_stylesheets(vfs.values())
+    # Rendering is CPU bound and holds the GIL, so split output is rendered in worker processes.
+    # The pool is capped by a setting, as os.cpu_count() would count the node's CPUs, not the pod's limit.
+    def __init__(self, vfs: Vfs, stylesheets: list[FileVersion]) -> None:
+        # Everything the renders need is read from storage here, before any workers are forked:
+        # the workers would otherwise share the database connection and the pooled storage client sockets.
+        self.contents = _read_files(vfs)
+        self.stylesheets = _get_stylesheets(vfs, stylesheets)
+
+    def compile(self, sources: list[FileWithData]) -> list[PdfWithData]:
+        max_workers = min(len(sources), settings.EMPRINTEN_MAX_WORKERS)
+        if max_workers <= 1:
+            return [_render_source(self.contents, self.stylesheets, source) for source in sources]
+
+        # Fork, so that the workers need not set up Django again. The initializer arguments
+        # are inherited by the forked workers, so the parsed stylesheets need not be pickled.
+        with concurrent.futures.ProcessPoolExecutor(
+            max_workers=max_workers,
+            mp_context=multiprocessing.get_context("fork"),
+            initializer=_init_worker,
+            initargs=(self.contents, self.stylesheets),
+        ) as executor:
+            return list(executor.map(_render_source_in_worker, sources))
+
+
+# Filled in each worker process by `_init_worker`.
+_worker_files: dict[str, typing.Any] = {}
+
+
+def _init_worker(contents: FileContents, stylesheets: list[weasyprint.CSS]) -> None:
+    _worker_files.update(contents=contents, stylesheets=stylesheets)
+
+
+def _render_source_in_worker(source_with_data: FileWithData) -> PdfWithData:
+    return _render_source(_worker_files["contents"], _worker_files["stylesheets"], source_with_data)
+
+
+def _render_source(
+    contents: FileContents,
+    stylesheets: list[weasyprint.CSS],
+    source_with_data: FileWithData,
+) -> PdfWithData:
+    source, row, template_success = source_with_data
+    pdf_html = weasyprint.HTML(
+        filename=source,
+        base_url=LOCAL_FILE_URI_PREFIX,
+        url_fetcher=functools.partial(_fetch_url, contents),
+    )
+    pdf = pdf_html.write_pdf(stylesheets=stylesheets)
+    # We don't give `target` parameter, so the function should return bytes.
+    if pdf is None:
+        raise RuntimeError("Unexpectedly None result")
 
-    @staticmethod
-    def find_stylesheets(files: typing.Iterable[FileVersion]) -> list[FileVersion]:
-        return [file_version for file_version in files if file_version.file.type == ProjectFile.Type.CSS]
-
-    def compile(self, sources: list[FileWithData], result_dir: str) -> list[FileWithData]:
-        parsed_sheets = [
-            weasyprint.CSS(
-                string=sheet_file.data.read(),
-                base_url=LOCAL_FILE_URI_PREFIX,
-                url_fetcher=self._do_lookup,
-            )
-            for sheet_file in self.stylesheets
-        ]
-        results: list[FileWithData] = []
-        for source, row, template_success in sources:
-            pdf_html = weasyprint.HTML(
-                filename=source,
-                base_url=LOCAL_FILE_URI_PREFIX,
-                url_fetcher=self._do_lookup,
-            )
-            pdf = pdf_html.write_pdf(
-                stylesheets=parsed_sheets,
-            )
-            # We don't give `target` parameter, so the function should return bytes.
-            if pdf is None:
-                raise RuntimeError("Unexpectedly None result")
-
-            dst_base = os.path.splitext(os.path.basename(source))[0]
-            dst_name = os.path.join(result_dir, dst_base + ".pdf")
-            results.append((dst_name, row, template_success))
-            with open(dst_name, "wb") as of:
-                of.write(pdf)
-
-        return results
-
-    # See `weasyprint.urls.default_url_fetcher` for function signature.
-    # Note: At least some exceptions are silently ignored by weasyprint.
-    def _do_lookup(self, url: str, timeout: int = 10, ssl_context=None) -> dict:
-        if url.startswith("data:"):
-            director = urllib.request.OpenerDirector()
-            director.add_handler(urllib.request.DataHandler())
-            data_response = director.open(url)
-            if data_response is None:
-                restricted_url = "Invalid data URL"
-                raise ValueError(restricted_url)
-            return {
-                "redirected_url": url,
-                "mime_type": data_response.headers["content-type"],
-                "string": data_response.file.read(),
-            }
-
-        file_url = url.removeprefix(LOCAL_FILE_URI_PREFIX)
-        if file_url == url:
-            restricted_url = "Invalid URL to look up for"
+    dst_name = os.path.splitext(os.path.basename(source))[0] + ".pdf"
+    return dst_name, pdf, row, template_success
+
+
+def _read_files(vfs: Vfs) -> FileContents:
+    return {file_name: _read_file(file_version) for file_name, file_version in vfs.items()}
+
+
+def _get_stylesheets(vfs: Vfs, stylesheets: list[FileVersion]) -> list[weasyprint.CSS]:
+    files = frozenset((file_name, _StoredFile.of(file_version)) for file_name, file_version in vfs.items())
+    return [_parse_stylesheet(_StoredFile.of(sheet_file), files) for sheet_file in stylesheets]
+
+
+# The whole file set is part of the key, as the stylesheet may @import other files of the project.
+@functools.lru_cache(maxsize=64)
+def _parse_stylesheet(sheet_file: _StoredFile, files: frozenset[tuple[str, _StoredFile]]) -> weasyprint.CSS:
+    vfs = {file_name: stored_file.file_version for file_name, stored_file in files}
+    return weasyprint.CSS(
+        string=_read_file(sheet_file.file_version),
+        base_url=LOCAL_FILE_URI_PREFIX,
+        url_fetcher=functools.partial(_fetch_url, _read_files(vfs)),
+    )
+
+
+# See `weasyprint.urls.default_url_fetcher` for function signature.
+# Note: At least some exceptions are silently ignored by weasyprint.
+def _fetch_url(contents: FileContents, url: str, timeout: int = 10, ssl_context=None) -> dict:
+    if url.startswith("data:"):
+        director = urllib.request.OpenerDirector()
+        director.add_handler(urllib.request.DataHandler())
+        data_response = director.open(url)
+        if data_response is None:
+            restricted_url = "Invalid data URL"
             raise ValueError(restricted_url)
-        the_file: FileVersion | None = self.vfs.get(file_url)
-        if DEBUG:
-            print("Pdf lookup", url, the_file)
-        if the_file is None:
-            raise KeyError
         return {
-            "file_obj": the_file.data.open("rb"),
-            # Weasyprint requires this to avoid file not found exc with the original filename.
-            "redirected_url": file_url,
+            "redirected_url": url,
+            "mime_type": data_response.headers["content-type"],
+            "string": data_response.file.read(),
         }
+
+    file_url = url.removeprefix(LOCAL_FILE_URI_PREFIX)
+    if file_url == url:
+        restricted_url = "Invalid URL to look up for"
+        raise ValueError(restricted_url)
+    the_file: bytes | None = contents.get(file_url)
+    if DEBUG:
+        print("Pdf lookup", url, the_file is not None)
+    if the_file is None:
+        raise KeyError
+    return {
+        "string": the_file,
+        # Weasyprint requires this to avoid file not found exc with the original filename.
+        "redirected_url": file_url,
+    }
@@ -1,8 +1,38 @@
 import datetime
+import io
+import pathlib
+import zipfile
 
+import jinja2
 import pytest
+from django.core.files.base import ContentFile
 
 from .functions import fi_bank_barcode
+from .models import FileVersion, Project, ProjectFile
+from .renderer import _get_environment, _TemplateCompiler, partition_files, render_pdf
+from .var_help import find_vars
+
+EXAMPLE_PNG = pathlib.Path(__file__).parent / "management" / "commands" / "example.png"
+
+
+@pytest.fixture
+def in_memory_storage(settings):
+    settings.STORAGES = {
+        **settings.STORAGES,
+        "default": {"BACKEND": "django.core.files.storage.InMemoryStorage"},
+    }
+
+
+def make_project_files(slug: str, files: dict[str, tuple[ProjectFile.Type, str | bytes]]) -> list[FileVersion]:
+    project = Project.objects.create(name=slug, slug=slug, split_output=False, title_pattern="")
+    for file_name, (file_type, content) in files.items():
+        project_file = ProjectFile.objects.create(project=project, file_name=file_name, type=file_type)
+        FileVersion.objects.create(
+            file=project_file,
+            current=True,
+            data=ContentFile(content.encode() if isinstance(content, str) else content, name=file_name),
+        )
+    return list(project.current_files())
 
 
 @pytest.mark.parametrize(
@@ -97,3 +127,101 @@ def test_fi_bank_barcode_invalid(iban: str, euro: int, cents: int, viite: str |
 
     result = fi_bank_barcode(iban, euro, cents, viite, _era)
     assert not result.valid
+
+
+@pytest.mark.django_db
+@pytest.mark.usefixtures("in_memory_storage")
+def test_render_split_output_in_workers(settings):
+    files = make_project_files(
+        "test-render-split-output",
+        {
+            "main.html": (ProjectFile.Type.Main, '<p class="name">{{ row.name }}</p><img src="example.png">'),
+            "example.css": (ProjectFile.Type.CSS, ".name { color: red; }"),
+            "example.png": (ProjectFile.Type.Image, EXAMPLE_PNG.read_bytes()),
+        },
+    )
+    data = [{"name": name} for name in ("first", "second", "third")]
+
+    def render_archive(max_workers: int) -> dict[str, bytes]:
+        settings.EMPRINTEN_MAX_WORKERS = max_workers
+        response = render_pdf(files, "{{ row.name }}", "{{ row.name }}", data, return_archive=True)
+        with zipfile.ZipFile(io.BytesIO(b"".join(response.streaming_content))) as archive:
+            return {name: archive.read(name) for name in archive.namelist()}
+
+    in_workers = render_archive(2)
+    in_process = render_archive(1)
+
+    assert len(in_workers) == len(data)
+    assert in_workers == in_process
+
+
+def compile_main(files: list[FileVersion], data: list[dict], src_dir: pathlib.Path) -> str:
+    project_files = partition_files(files)
+    assert project_files.main is not None
+    env = _TemplateCompiler(project_files.vfs, handle_errors=False)
+    with env.activate():
+        ((src_name, _row, success),) = env.compile(
+            project_files.main.file.file_name,
+            str(src_dir),
+            data,
+            "",
+            {},
+            split_output=False,
+        )
+    assert success
+    return pathlib.Path(src_name).read_text()
+
+
+@pytest.mark.django_db
+@pytest.mark.usefixtures("in_memory_storage")
+def test_templates_of_projects_are_kept_apart(tmp_path: pathlib.Path):
+    first = make_project_files(
+        "test-templates-first",
+        {
+            "main.html": (ProjectFile.Type.Main, "<p>first {{ row.name }}</p>{% include 'part.html' %}"),
+            "part.html": (ProjectFile.Type.HTML, "<p>first part</p>"),
+        },
+    )
+    second = make_project_files(
+        "test-templates-second",
+        {
+            "main.html": (ProjectFile.Type.Main, "<p>second {{ row.name }}</p>{% include 'part.html' %}"),
+            "part.html": (ProjectFile.Type.HTML, "<p>second part</p>"),
+        },
+    )
+    data = [{"name": "row"}]
+
+    (tmp_path / "first").mkdir()
+    (tmp_path / "second").mkdir()
+    (tmp_path / "again").mkdir()
+    first_html = compile_main(first, data, tmp_path / "first")
+    second_html = compile_main(second, data, tmp_path / "second")
+    first_again_html = compile_main(first, data, tmp_path / "again")
+
+    assert "<p>first row</p><p>first part</p>" in first_html
+    assert "<p>second row</p><p>second part</p>" in second_html
+    assert "first" not in second_html
+    assert first_again_html == first_html
+
+
+def test_template_not_found_without_active_project():
+    with pytest.raises(jinja2.TemplateNotFound):
+        _get_environment().get_template("main.html")
+
+
+@pytest.mark.django_db
+@pytest.mark.usefixtures("in_memory_storage")
+def test_find_vars():
+    files = make_project_files(
+        "test-find-vars",
+        {
+            "main.html": (ProjectFile.Type.Main, "<p>{{ row.first_name|upper }} {{ row.last_name }}</p>"),
+        },
+    )
+
+    assert find_vars(files, "{{ row.badge_id }}.pdf", "{{ row.nick }}") == {
+        "first_name",
+        "last_name",
+        "badge_id",
+        "nick",
+    }
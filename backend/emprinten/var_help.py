@@ -3,7 +3,7 @@ import typing
 import jinja2.compiler
 
 from .models import FileVersion
-from .renderer import _TemplateCompiler, files_to_vfs, find_main
+from .renderer import _TemplateCompiler, partition_files
 
 
 def _parse_node(node: jinja2.compiler.nodes.Node, out: set[str]):
@@ -41,8 +41,9 @@ def _parse_vars(env: _TemplateCompiler, source: str | None, **kwargs) -> set[str
 
 
 def find_vars(files: typing.Iterable[FileVersion], file_name_template: str, title_template: str) -> set[str]:
-    env = _TemplateCompiler(files_to_vfs(files), handle_errors=False)
-    main = find_main(files)
+    project_files = partition_files(files)
+    env = _TemplateCompiler(project_files.vfs, handle_errors=False)
+    main = project_files.main
     if main is None:
         return set()
     main_source = env.get_source(main.file.file_name)
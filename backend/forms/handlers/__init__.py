@@ -1 +1 @@
-from . import dimension, form
+from . import dimension, form, survey
@@ -24,6 +24,7 @@ def program_dimension_value_pre_save(sender, instance: ResponseDimensionValue, *
 def dimension_post_save(sender, instance: Dimension | DimensionValue, **kwargs):
     Response.refresh_cached_dimensions_qs(instance.survey.responses.all())
     Form.refresh_enriched_fields_qs(instance.survey.languages.all())
+    instance.survey.refresh_cached_fields_identical_across_languages()
 
 
 @receiver([post_save, post_delete], sender=ResponseDimensionValue)
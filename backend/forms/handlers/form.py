@@ -4,6 +4,7 @@ from django.dispatch import receiver
 from core.utils.model_utils import slugify
 
 from ..models.form import Form
+from ..models.survey import Survey
 
 
 @receiver(pre_save, sender=Form)
@@ -32,3 +33,6 @@ def form_post_save(sender, instance: Form, *, created: bool, update_fields: list
 
     instance.cached_enriched_fields = instance._build_enriched_fields()
     instance.save(update_fields=["cached_enriched_fields"])
+
+    for survey in Survey.objects.filter(languages=instance):
+        survey.refresh_cached_fields_identical_across_languages()
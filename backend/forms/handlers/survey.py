@@ -0,0 +1,20 @@
+from django.db.models.signals import m2m_changed
+from django.dispatch import receiver
+
+from ..models.survey import Survey
+
+
+@receiver(m2m_changed, sender=Survey.languages.through)
+def survey_languages_m2m_changed(sender, instance, action: str, reverse: bool, pk_set: set[int] | None, **kwargs):
+    if action not in ("post_add", "post_remove", "post_clear"):
+        return
+
+    if reverse:
+        # instance is a Form and pk_set contains the surveys.
+        # NOTE: pk_set is None on clear, but removing language versions cannot make them differ.
+        surveys = Survey.objects.filter(pk__in=pk_set or [])
+    else:
+        surveys = [instance]
+
+    for survey in surveys:
+        survey.refresh_cached_fields_identical_across_languages()
@@ -0,0 +1,45 @@
+from django.db import migrations, models
+
+
+def get_field_structure(fields):
+    # copy of forms.utils.merge_form_fields.get_field_structure as of this migration
+    return {
+        field["slug"]: (
+            frozenset(choice["slug"] for choice in field.get("choices") or []),
+            frozenset(question["slug"] for question in field.get("questions") or []),
+        )
+        for field in fields
+    }
+
+
+def populate_cached_fields_identical_across_languages(apps, schema_editor):
+    Survey = apps.get_model("forms", "Survey")
+    bulk_update = []
+    for survey in Survey.objects.prefetch_related("languages"):
+        forms = list(survey.languages.all())
+        if any(form.fields and not form.cached_enriched_fields for form in forms):
+            # enriched fields not built yet, the flag will be set when they are
+            continue
+
+        structures = [get_field_structure(form.cached_enriched_fields) for form in forms]
+        survey.cached_fields_identical_across_languages = all(
+            structure == structures[0] for structure in structures[1:]
+        )
+        bulk_update.append(survey)
+
+    Survey.objects.bulk_update(bulk_update, ["cached_fields_identical_across_languages"], batch_size=100)
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("forms", "0029_formseventmeta"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="survey",
+            name="cached_fields_identical_across_languages",
+            field=models.BooleanField(default=False),
+        ),
+        migrations.RunPython(populate_cached_fields_identical_across_languages, migrations.RunPython.noop),
+    ]
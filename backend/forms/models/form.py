@@ -12,7 +12,7 @@ from django.utils.translation import gettext_lazy as _
 from core.models.event import Event
 from core.utils import NONUNIQUE_SLUG_FIELD_PARAMS
 from core.utils.locale_utils import get_message_in_language
-from graphql_api.language import DEFAULT_LANGUAGE, LANGUAGE_CHOICES
+from graphql_api.language import DEFAULT_LANGUAGE, LANGUAGE_CHOICES, SUPPORTED_LANGUAGES
 
 from .field import Field
 
@@ -80,6 +80,8 @@ class Form(models.Model):
 
         return self.cached_enriched_fields
 
+    form_batch_size = 100
+
     @classmethod
     @transaction.atomic
     def refresh_enriched_fields_qs(cls, qs: models.QuerySet[Self]):
@@ -90,7 +92,7 @@ class Form(models.Model):
         for form in qs.select_for_update(of=("self",)):
             form.cached_enriched_fields = form._build_enriched_fields()
             forms_to_update.append(form)
-        cls.objects.bulk_update(forms_to_update, ["cached_enriched_fields"])
+        cls.objects.bulk_update(forms_to_update, ["cached_enriched_fields"], batch_size=cls.form_batch_size)
 
     def refresh_enriched_fields(self):
         """
@@ -159,6 +161,27 @@ class Form(models.Model):
     def validated_fields(self):
         return [Field.model_validate(field_dict) for field_dict in self.enriched_fields]
 
+    @staticmethod
+    def get_language_version(forms: models.QuerySet[Form], requested_language: str) -> Form | None:
+        """
+        Returns the form in the requested language, or failing that, in the first language
+        of SUPPORTED_LANGUAGES that has one. Uses the forms if they are prefetched,
+        otherwise lets the database pick the form so that only it is fetched.
+        """
+        language_codes = [requested_language] + [
+            language.code for language in SUPPORTED_LANGUAGES if language.code != requested_language
+        ]
+
+        if forms._result_cache is not None:
+            forms_by_language = {form.language: form for form in forms}
+            return next((forms_by_language[code] for code in language_codes if code in forms_by_language), None)
+
+        return (
+            forms.filter(language__in=language_codes)
+            .order_by(models.Case(*(models.When(language=code, then=rank) for rank, code in enumerate(language_codes))))
+            .first()
+        )
+
     @property
     def survey(self) -> Survey | None:
         from .survey import Survey
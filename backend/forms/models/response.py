@@ -73,6 +73,8 @@ class Response(models.Model):
 
         return new_cached_dimensions
 
+    response_batch_size = 100
+
     @classmethod
     @transaction.atomic
     def refresh_cached_dimensions_qs(cls, responses: models.QuerySet[Response]):
@@ -91,7 +93,7 @@ class Response(models.Model):
         ):
             response.cached_dimensions = response._build_cached_dimensions()
             bulk_update.append(response)
-        cls.objects.bulk_update(bulk_update, ["cached_dimensions"])
+        cls.objects.bulk_update(bulk_update, ["cached_dimensions"], batch_size=cls.response_batch_size)
 
     def refresh_cached_dimensions(self):
         self.cached_dimensions = self._build_cached_dimensions()
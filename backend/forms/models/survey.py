@@ -16,11 +16,12 @@ from core.utils import NONUNIQUE_SLUG_FIELD_PARAMS, is_within_period, log_get_or
 from core.utils.pkg_resources_compat import resource_stream
 from graphql_api.language import DEFAULT_LANGUAGE, SUPPORTED_LANGUAGES
 
-from ..utils.merge_form_fields import merge_fields
+from ..utils.merge_form_fields import get_field_structure, merge_fields
 from .form import Form
 
 if TYPE_CHECKING:
     from .dimension import Dimension, DimensionValue
+    from .field import Field
 
 logger = logging.getLogger("kompassi")
 ANONYMITY_CHOICES = [
@@ -110,6 +111,10 @@ class Survey(models.Model):
         blank=True,
     )
 
+    # cached fields
+    # True if all language versions have the same fields, choices and questions (by slug)
+    cached_fields_identical_across_languages = models.BooleanField(default=False)
+
     # related fields
     dimensions: models.QuerySet[Dimension]
 
@@ -132,41 +137,65 @@ class Survey(models.Model):
         See ../graphql.py:SurveyType.resolve_combined_fields
         for documentation.
         """
-        # TODO as an optimization, store boolean field in survey model that indicates
-        # whether the fields are the same across languages. If so, return the fields
-        # from the base language directly.
+        if not hasattr(self, "_combined_fields"):
+            self._combined_fields: dict[str, list[Field]] = {}
 
-        # if a specific language is requested, put it first
-        languages = sorted(
-            self.languages.all().only("language", "fields"),
-            key=lambda form: form.language != base_language,
-        )
+        if (combined_fields := self._combined_fields.get(base_language)) is not None:
+            return combined_fields
 
-        return merge_fields(languages)
+        if self.cached_fields_identical_across_languages:
+            form = self.get_form(base_language)
+            combined_fields = form.validated_fields if form else []
+        else:
+            # if a specific language is requested, put it first
+            forms = self.languages.all()
+            if forms._result_cache is not None:
+                # prefetched
+                languages = sorted(forms, key=lambda form: form.language != base_language)
+            else:
+                languages = list(
+                    forms.only("language", "fields", "cached_enriched_fields").order_by(
+                        models.Case(models.When(language=base_language, then=0), default=1)
+                    )
+                )
+            if len(languages) == 1:
+                # nothing to merge (the cached flag may not have been computed yet)
+                combined_fields = languages[0].validated_fields
+            else:
+                combined_fields = merge_fields(languages)
+
+        self._combined_fields[base_language] = combined_fields
+        return combined_fields
+
+    def _build_fields_identical_across_languages(self) -> bool:
+        structures = [get_field_structure(form.enriched_fields) for form in self.languages.all()]
+        return all(structure == structures[0] for structure in structures[1:])
+
+    def refresh_cached_fields_identical_across_languages(self):
+        # called when language versions change, so drop what was memoized from the old ones
+        for attr in ("_combined_fields", "_language_ids"):
+            self.__dict__.pop(attr, None)
+
+        self.cached_fields_identical_across_languages = self._build_fields_identical_across_languages()
+        self.save(update_fields=["cached_fields_identical_across_languages"])
 
     def get_form(self, requested_language: str) -> Form | None:
-        try:
-            return self.languages.get(language=requested_language)
-        except Form.DoesNotExist:
-            pass
-
-        for language in SUPPORTED_LANGUAGES:
-            if language.code == requested_language:
-                # already tried above, skip one extra query
-                continue
-
-            try:
-                return self.languages.get(language=language.code)
-            except Form.DoesNotExist:
-                pass
-
-        return None
+        return Form.get_language_version(self.languages.all(), requested_language)
 
     @property
     def responses(self):
         from .response import Response
 
-        return Response.objects.filter(form__in=self.languages.all()).order_by("created_at")
+        # resolve language ids once and pass them as a literal IN list instead of a subquery
+        if not hasattr(self, "_language_ids"):
+            languages = self.languages.all()
+            if languages._result_cache is not None:
+                # prefetched
+                self._language_ids = [form.pk for form in languages]
+            else:
+                self._language_ids = list(languages.values_list("pk", flat=True))
+
+        return Response.objects.filter(form_id__in=self._language_ids).order_by("created_at")
 
     @property
     def can_remove(self):
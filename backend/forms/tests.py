@@ -12,9 +12,10 @@ from .graphql.mutations.put_survey_dimension import PutSurveyDimension
 from .graphql.mutations.update_response_dimensions import UpdateResponseDimensions
 from .models.dimension import Dimension, DimensionValue
 from .models.field import Choice, Field, FieldType
+from .models.form import Form
 from .models.response import Response
 from .models.survey import Survey
-from .utils.merge_form_fields import _merge_choices, _merge_fields
+from .utils.merge_form_fields import _merge_choices, _merge_fields, merge_fields
 from .utils.process_form_data import FieldWarning, process_form_data
 from .utils.s3_presign import BUCKET_NAME, S3_ENDPOINT_URL
 from .utils.summarize_responses import MatrixFieldSummary, SelectFieldSummary, TextFieldSummary, summarize_responses
@@ -763,3 +764,72 @@ def test_survey_without_forms(_patched_graphql_check_instance):
     )
 
     assert not result.errors
+
+
+@pytest.mark.django_db
+def test_survey_get_form():
+    event, _created = Event.get_or_create_dummy()
+
+    survey = Survey.objects.create(
+        event=event,
+        slug="test-survey",
+    )
+
+    assert survey.get_form("fi") is None
+
+    form_fi = survey.languages.create(event=event, slug="test-survey-fi", language="fi")
+    form_sv = survey.languages.create(event=event, slug="test-survey-sv", language="sv")
+
+    for fetched_survey in (
+        Survey.objects.get(pk=survey.pk),
+        Survey.objects.prefetch_related("languages").get(pk=survey.pk),
+    ):
+        assert fetched_survey.get_form("fi") == form_fi
+        assert fetched_survey.get_form("sv") == form_sv
+
+        # falls back in the order of SUPPORTED_LANGUAGES (en, fi, sv)
+        assert fetched_survey.get_form("en") == form_fi
+
+
+@pytest.mark.django_db
+def test_survey_fields_identical_across_languages():
+    event, _created = Event.get_or_create_dummy()
+
+    survey = Survey.objects.create(
+        event=event,
+        slug="test-identical-survey",
+    )
+    form_fi = Form.objects.create(
+        event=event,
+        slug="test-identical-survey-fi",
+        language="fi",
+        fields=[dict(slug="name", type="SingleLineText", title="Nimi")],
+    )
+    form_en = Form.objects.create(
+        event=event,
+        slug="test-identical-survey-en",
+        language="en",
+        fields=[dict(slug="name", type="SingleLineText", title="Name")],
+    )
+
+    assert not survey.cached_fields_identical_across_languages
+
+    survey.languages.set([form_fi, form_en])
+    assert survey.cached_fields_identical_across_languages
+    assert Survey.objects.get(pk=survey.pk).cached_fields_identical_across_languages
+
+    # the fast path yields what merging the language versions would
+    assert survey.get_combined_fields("fi") == merge_fields([form_fi, form_en])
+    assert survey.get_combined_fields("en") == merge_fields([form_en, form_fi])
+
+    # refreshing drops what was memoized from the old language versions
+    assert hasattr(survey, "_combined_fields")
+    survey.refresh_cached_fields_identical_across_languages()
+    assert not hasattr(survey, "_combined_fields")
+
+    form_en.fields = [*form_en.fields, dict(slug="email", type="SingleLineText", title="Email")]
+    form_en.save()
+
+    fetched_survey = Survey.objects.get(pk=survey.pk)
+    assert not fetched_survey.cached_fields_identical_across_languages
+    assert {field.slug for field in fetched_survey.get_combined_fields("fi")} == {"name", "email"}
@@ -6,9 +6,9 @@ Note that fields present in only one language version are not guaranteed to be
 in any particular order.
 """
 
-from collections.abc import Iterable, Sequence
+from collections.abc import Iterable, Mapping, Sequence
 from functools import reduce
-from typing import Protocol, TypeVar
+from typing import Any, Protocol, TypeVar
 
 from ..models.field import Field
 from ..models.form import Form
@@ -51,3 +51,23 @@ def _merge_fields(fields: Sequence[Field], other_fields: Sequence[Field]) -> lis
 
 def merge_fields(forms: Iterable[Form]) -> list[Field]:
     return reduce(_merge_fields, (form.validated_fields for form in forms), [])
+
+
+FieldStructure = dict[str, tuple[frozenset[str], frozenset[str]]]
+
+
+def get_field_structure(fields: Iterable[Mapping[str, Any]]) -> FieldStructure:
+    """
+    Returns the slugs of the fields and those of their choices and questions.
+    If all language versions of a form have the same structure, merging them yields
+    the fields of the base language, so `merge_fields` need not be called.
+
+    Operates on enriched field dicts so that it can be used without validating the fields.
+    """
+    return {
+        field["slug"]: (
+            frozenset(choice["slug"] for choice in field.get("choices") or []),
+            frozenset(question["slug"] for question in field.get("questions") or []),
+        )
+        for field in fields
+    }
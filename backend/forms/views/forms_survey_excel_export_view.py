@@ -18,10 +18,10 @@ def forms_survey_excel_export_view(
 
     if event_slug:
         event = get_object_or_404(Event, slug=event_slug)
-        survey = get_object_or_404(Survey, event=event, slug=survey_slug)
+        survey = get_object_or_404(Survey.objects.prefetch_related("languages"), event=event, slug=survey_slug)
         filename = f"{event.slug}_{survey.slug}_responses_{timestamp}.xlsx"
     else:
-        survey = get_object_or_404(Survey, event__isnull=True, slug=survey_slug)
+        survey = get_object_or_404(Survey.objects.prefetch_related("languages"), event__isnull=True, slug=survey_slug)
         filename = f"{survey.slug}_responses_{timestamp}.xlsx"
 
     # TODO(#324): Failed check causes 500 now, turn it to 403 (middleware?)
@@ -35,6 +35,7 @@ class IntraEventMeta(EventMetaBase):
         )
 
     def is_user_organizer(self, user):
+        # cached on the user object, see GroupManagementMixin.is_user_in_group
         return self.is_user_in_group(user, self.organizer_group)
 
     def is_user_allowed_to_access(self, user):
@@ -43,15 +44,30 @@ class IntraEventMeta(EventMetaBase):
     @property
     def unassigned_organizers(self):
         if not hasattr(self, "_unassigned_organizers"):
-            self._unassigned_organizers = []
-            for person in Person.objects.filter(
-                user__groups=self.organizer_group,
-            ).exclude(
-                user__person__team_memberships__team__event_id=self.event.id,
+            people = list(
+                Person.objects.filter(
+                    user__groups=self.organizer_group,
+                )
+                .exclude(
+                    user__person__team_memberships__team__event_id=self.event_id,
+                )
+                .select_related("user")
+            )
+
+            signups_by_person_id = {}
+            for signup in (
+                Signup.objects.filter(event_id=self.event_id, person__in=people)
+                .prefetch_related("personnel_classes")
+                .order_by("-id")
             ):
-                signup = Signup.objects.filter(event=self.event, person=person).first()
-                if signup:
-                    self._unassigned_organizers.append(UnassignedOrganizer(person=person, signup=signup))
+                # iterating in reverse so that the first signup per person wins
+                signups_by_person_id[signup.person_id] = signup
+
+            self._unassigned_organizers = [
+                UnassignedOrganizer(person=person, signup=signup)
+                for person in people
+                if (signup := signups_by_person_id.get(person.id))
+            ]
 
         return self._unassigned_organizers
 
@@ -1,5 +1,7 @@
 from django.test import TestCase
 
+from labour.models import Signup
+
 from .models import IntraEventMeta, TeamMember
 
 
@@ -19,3 +21,19 @@ class TeamMembersTestCase(TestCase):
         team_member.delete()
 
         assert not person.user.groups.filter(id=group.id).exists()
+
+
+class UnassignedOrganizersTestCase(TestCase):
+    def setUp(self):
+        self.meta, unused = IntraEventMeta.get_or_create_dummy()
+        self.event = self.meta.event
+
+    def test_unassigned_organizers(self):
+        signup, unused = Signup.get_or_create_dummy(event=self.event, accepted=True)
+        person = signup.person
+        self.meta.organizer_group.user_set.add(person.user)
+
+        unassigned_organizers = self.meta.unassigned_organizers
+
+        assert [(organizer.person, organizer.signup) for organizer in unassigned_organizers] == [(person, signup)]
+        assert unassigned_organizers[0].signup.personnel_class == signup.personnel_classes.first()
@@ -492,3 +492,7 @@ KOMPASSI_SSH_KNOWN_HOSTS_FILE = env("KOMPASSI_SSH_KNOWN_HOSTS_FILE", default="/m
 # used by manage.py setup to noop if already run for this deploy
 KOMPASSI_SETUP_RUN_ID = env("KOMPASSI_SETUP_RUN_ID", default="")
 KOMPASSI_SETUP_EXPIRE_SECONDS = 300
+
+# Worker processes forked by emprinten to render split PDF output, per request.
+# Every gunicorn worker may fork this many, so keep it small. 1 renders in the request process.
+EMPRINTEN_MAX_WORKERS = env.int("EMPRINTEN_MAX_WORKERS", default=2)
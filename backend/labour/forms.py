@@ -103,7 +103,12 @@ class SignupForm(forms.ModelForm, SignupFormMixin):
     def clean_job_categories(self):
         job_categories = self.cleaned_data["job_categories"]
 
-        if not all(jc.is_person_qualified(self.instance.person) for jc in job_categories):
+        person = self.instance.person
+        person_qualification_ids = JobCategory.get_person_qualification_ids(person)
+        if not all(
+            jc.is_person_qualified(person, person_qualification_ids)
+            for jc in job_categories.prefetch_related("required_qualifications")
+        ):
             raise forms.ValidationError("Sinulla ei ole vaadittuja pätevyyksiä valitsemiisi tehtäviin.")
 
         return job_categories
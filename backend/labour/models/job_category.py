@@ -1,22 +1,31 @@
 from __future__ import annotations
 
+from collections.abc import Collection, Iterable
 from typing import TYPE_CHECKING
 
 from django.db import models, transaction
+from django.db.models import Prefetch
 from django.utils.translation import gettext_lazy as _
 
-from core.models import Event
+from core.models import Event, Person
 from core.utils import NONUNIQUE_SLUG_FIELD_PARAMS, omit_keys, pick_attrs, slugify
 
 from .personnel_class import PersonnelClass
 from .qualifications import Qualification
+from .roster import Job, JobRequirement, Shift
 
 if TYPE_CHECKING:
-    from .roster import Job
     from .signup import Signup
 
 
-def format_job_categories(job_categories):
+def format_job_categories(job_categories: Iterable[JobCategory | PersonnelClass]) -> str:
+    """
+    Pass prefetched querysets when formatting many signups. An unevaluated queryset
+    only fetches the names instead of instantiating the job categories.
+    """
+    if isinstance(job_categories, models.QuerySet) and job_categories._result_cache is None:
+        return ", ".join(job_categories.values_list("name", flat=True))
+
     return ", ".join(jc.name for jc in job_categories)
 
 
@@ -129,15 +138,49 @@ class JobCategory(models.Model):
     def group(self):
         from django.contrib.auth.models import Group
 
-        return Group.objects.get(name=self.event.labour_event_meta.make_group_name(self.event, self.slug))
+        from .labour_event_meta import LabourEventMeta
+
+        if not hasattr(self, "_group"):
+            # make_group_name is a classmethod, no need to fetch the event meta for it
+            self._group = Group.objects.get(name=LabourEventMeta.make_group_name(self.event, self.slug))
+
+        return self._group
 
-    def is_person_qualified(self, person):
-        if not self.required_qualifications.exists():
+    @staticmethod
+    def get_person_qualification_ids(person) -> set[int]:
+        return set(person.qualifications.values_list("qualification_id", flat=True))
+
+    def is_person_qualified(self, person, person_qualification_ids: Collection[int] | None = None):
+        """
+        When checking many job categories against the same person, pass
+        `person_qualification_ids` from `get_person_qualification_ids` to avoid refetching them
+        and prefetch `required_qualifications` on the job categories.
+        """
+        # .all() instead of .values_list() so that prefetched required_qualifications are used
+        required_ids = {qualification.pk for qualification in self.required_qualifications.all()}
+        if not required_ids:
             return True
 
-        else:
-            quals = [pq.qualification for pq in person.qualifications.all()]
-            return all(qual in quals for qual in self.required_qualifications.all())
+        if person_qualification_ids is None:
+            person_qualification_ids = self.get_person_qualification_ids(person)
+
+        return required_ids.issubset(person_qualification_ids)
+
+    def filter_qualified_people(self, people: models.QuerySet[Person]) -> models.QuerySet[Person]:
+        """
+        Like `is_person_qualified`, but for many people at once and in the database.
+        """
+        required_ids = {qualification.pk for qualification in self.required_qualifications.all()}
+        if not required_ids:
+            return people
+
+        return people.annotate(
+            num_required_qualifications=models.Count(
+                "qualifications__qualification",
+                filter=models.Q(qualifications__qualification__in=required_ids),
+                distinct=True,
+            )
+        ).filter(num_required_qualifications=len(required_ids))
 
     class Meta:
         verbose_name = _("job category")
@@ -164,39 +207,44 @@ class JobCategory(models.Model):
         from core.models import Event
 
         event, unused = Event.get_or_create_dummy()
-        jc1, unused = cls.objects.get_or_create(event=event, name="Dummy 1", slug="dummy-1")
-        jc2, unused = cls.objects.get_or_create(event=event, name="Dummy 2", slug="dummy-2")
+        cls.objects.bulk_create(
+            [
+                cls(event=event, name="Dummy 1", slug="dummy-1"),
+                cls(event=event, name="Dummy 2", slug="dummy-2"),
+            ],
+            ignore_conflicts=True,
+        )
 
-        return [jc1, jc2]
+        return list(cls.objects.filter(event=event, slug__in=["dummy-1", "dummy-2"]).order_by("slug"))
 
     def _make_requirements(self):
         """
         Returns an array of integers representing the sum of JobRequirements for this JobCategory
         where indexes correspond to those of work_hours for this event.
         """
-        from .roster import JobRequirement
-
         requirements = JobRequirement.objects.filter(job__job_category=self)
         return JobRequirement.requirements_as_integer_array(self.event, requirements)
 
     def _make_allocated(self):
-        from .roster import JobRequirement, Shift
-
         shifts = Shift.objects.filter(job__job_category=self)
         return JobRequirement.allocated_as_integer_array(self.event, shifts)
 
+    @staticmethod
+    def _get_active_accepted_signups_queryset(signups: models.QuerySet[Signup]) -> models.QuerySet[Signup]:
+        return (
+            signups.filter(is_active=True)
+            .order_by("person__surname", "person__first_name")
+            .select_related("person", "event__laboureventmeta")
+        )
+
     def _make_people(self):
         """
         Returns an array of accepted workers. Used by the Roster API.
         """
-        return [
-            signup.as_dict()
-            for signup in (
-                self.accepted_signups.filter(is_active=True)
-                .order_by("person__surname", "person__first_name")
-                .select_related("person")
-            )
-        ]
+        if (signups := getattr(self, "active_accepted_signups", None)) is None:
+            signups = self._get_active_accepted_signups_queryset(self.accepted_signups.all())
+
+        return [signup.as_dict() for signup in signups]
 
     def save(self, *args, **kwargs):
         if self.name and not self.slug:
@@ -226,5 +274,27 @@ class JobCategory(models.Model):
 
         return doc
 
+    @classmethod
+    def roster_api_queryset(cls, event: Event) -> models.QuerySet[JobCategory]:
+        """
+        Prefetches everything `as_roster_api_dict` needs so that its query count
+        does not grow with the number of jobs, shifts and people.
+        """
+        from .signup import Signup
+
+        return (
+            cls.objects.filter(event=event)
+            .select_related("event__laboureventmeta")
+            .prefetch_related(
+                "jobs__requirements",
+                Prefetch("jobs__shifts", queryset=Shift.objects.select_related("signup__person")),
+                Prefetch(
+                    "accepted_signups",
+                    queryset=cls._get_active_accepted_signups_queryset(Signup.objects.all()),
+                    to_attr="active_accepted_signups",
+                ),
+            )
+        )
+
     def as_roster_api_dict(self):
         return self.as_dict(include_jobs=True, include_people=True, include_shifts=True)
@@ -53,10 +53,15 @@ def test_qualifications():
     assert not jc1.is_person_qualified(person)
     assert jc2.is_person_qualified(person)
 
+    people = Person.objects.filter(pk=person.pk)
+    assert not jc1.filter_qualified_people(people).exists()
+    assert jc2.filter_qualified_people(people).exists()
+
     person.qualifications.create(qualification=qualification1)
 
     assert jc1.is_person_qualified(person)
     assert jc2.is_person_qualified(person)
+    assert jc1.filter_qualified_people(people).exists()
 
 
 @pytest.mark.django_db
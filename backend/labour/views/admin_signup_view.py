@@ -74,8 +74,11 @@ def admin_signup_view(request, vars, event, person_id):
 
             messages.error(request, "Ole hyvä ja tarkista lomake.")
 
+    person_qualification_ids = JobCategory.get_person_qualification_ids(signup.person)
     non_qualified_category_names = [
-        jc.name for jc in JobCategory.objects.filter(event=event) if not jc.is_person_qualified(signup.person)
+        jc.name
+        for jc in JobCategory.objects.filter(event=event).prefetch_related("required_qualifications")
+        if not jc.is_person_qualified(signup.person, person_qualification_ids)
     ]
 
     non_applied_categories = list(JobCategory.objects.filter(event=event))
@@ -22,6 +22,11 @@ from ..models import (
 logger = logging.getLogger("kompassi")
 
 
+def _get_roster_api_dict(event, job_category_slug):
+    # fetched anew after modifications so that the prefetched data is fresh
+    return get_object_or_404(JobCategory.roster_api_queryset(event), slug=job_category_slug).as_roster_api_dict()
+
+
 @labour_admin_required
 @require_safe
 @api_view
@@ -33,11 +38,7 @@ def api_job_categories_view(request, vars, event):
 @require_safe
 @api_view
 def api_job_category_view(request, vars, event, job_category_slug):
-    return get_object_or_404(JobCategory, event=event, slug=job_category_slug).as_dict(
-        include_jobs=True,
-        include_shifts=True,
-        include_people=True,
-    )
+    return _get_roster_api_dict(event, job_category_slug)
 
 
 @labour_admin_required
@@ -54,14 +55,14 @@ def api_job_view(request, vars, event, job_category_slug, job_slug=None):
     elif request.method == "DELETE" and job_slug is not None:
         job = get_object_or_404(Job, job_category=job_category, slug=job_slug)
         job.delete()
-        return job_category.as_roster_api_dict()
+        return _get_roster_api_dict(event, job_category_slug)
     else:
         raise MethodNotAllowed(request.method)
 
     job.title = body.title
     job.save()
 
-    return job_category.as_roster_api_dict()
+    return _get_roster_api_dict(event, job_category_slug)
 
 
 @labour_admin_required
@@ -78,14 +79,14 @@ def api_shift_view(request, vars, event, job_category_slug, shift_id=None):
     elif request.method == "DELETE" and shift_id is not None:
         shift = get_object_or_404(Shift, id=int(shift_id), job__job_category=job_category)
         shift.delete()
-        return job_category.as_roster_api_dict()
+        return _get_roster_api_dict(event, job_category_slug)
     else:
         raise MethodNotAllowed(request.method)
 
     edit_shift_request.update(job_category, shift)
     shift.save()
 
-    return job_category.as_roster_api_dict()
+    return _get_roster_api_dict(event, job_category_slug)
 
 
 @labour_admin_required
@@ -117,4 +118,4 @@ def api_set_job_requirements_view(request, vars, event, job_category_slug, job_s
             requirement.save()
 
     # Successful result emulates that of /api/v1/events/tracon11/jobcategories/conitea
-    return job_category.as_roster_api_dict()
+    return _get_roster_api_dict(event, job_category_slug)
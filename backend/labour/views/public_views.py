@@ -149,8 +149,11 @@ def signup_view(request, event, alternative_form_slug=None):
     all_job_categories = JobCategory.objects.filter(event=event)
 
     # FIXME use id and data attr instead of category name
+    person_qualification_ids = JobCategory.get_person_qualification_ids(request.user.person)
     non_qualified_category_names = [
-        jc.name for jc in available_job_categories if not jc.is_person_qualified(request.user.person)
+        jc.name
+        for jc in available_job_categories.prefetch_related("required_qualifications")
+        if not jc.is_person_qualified(request.user.person, person_qualification_ids)
     ]
 
     vars = dict(
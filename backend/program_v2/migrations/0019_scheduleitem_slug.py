@@ -6,11 +6,22 @@ from django.db import migrations, models
 from core.utils.model_utils import slugify
 
 
-def populate_slug(apps, schema_editor):
+def populate_slug(apps, schema_editor, batch_size=1000):
     ScheduleItem = apps.get_model("program_v2", "ScheduleItem")
-    for schedule_item in ScheduleItem.objects.all():
+    bulk_update = []
+    for schedule_item in (
+        ScheduleItem.objects.select_related("program")
+        .only("id", "subtitle", "program__slug")
+        .iterator(chunk_size=batch_size)
+    ):
         schedule_item.slug = f"{schedule_item.program.slug}-{slugify(schedule_item.subtitle)}"
-        schedule_item.save(update_fields=["slug"])
+        bulk_update.append(schedule_item)
+
+        if len(bulk_update) >= batch_size:
+            ScheduleItem.objects.bulk_update(bulk_update, ["slug"])
+            bulk_update = []
+
+    ScheduleItem.objects.bulk_update(bulk_update, ["slug"])
 
 
 class Migration(migrations.Migration):
@@ -1,4 +1,5 @@
 from dataclasses import dataclass
+from functools import cache
 
 from django.db import models
 
@@ -56,31 +57,39 @@ class ProgramV2EventMeta(EventMetaBase):
 
     @property
     def importer_class(self):
-        from ..importers.default import DefaultImporter
-        from ..importers.hitpoint2024 import HitpointImporter
-        from ..importers.noop import NoopImporter
-        from ..importers.ropecon2024 import RopeconImporter
-        from ..importers.tracon2024 import TraconImporter
-
-        match self.importer_name:
-            case "default":
-                return DefaultImporter
-            case "noop":
-                return NoopImporter
-            case "ropecon2024":
-                return RopeconImporter
-            case "tracon2024":
-                return TraconImporter
-            case "hitpoint2024":
-                return HitpointImporter
-            case unimplemented_importer_name:
-                raise NotImplementedError(unimplemented_importer_name)
+        return get_importer_class(self.importer_name)
 
     @property
     def is_auto_importing_from_v1(self):
         return self.importer_name != ""
 
 
+@cache
+def get_importer_class(importer_name: str):
+    """
+    Resolved by name instead of caching on the instance, so changing `importer_name` needs no invalidation.
+    """
+    from ..importers.default import DefaultImporter
+    from ..importers.hitpoint2024 import HitpointImporter
+    from ..importers.noop import NoopImporter
+    from ..importers.ropecon2024 import RopeconImporter
+    from ..importers.tracon2024 import TraconImporter
+
+    match importer_name:
+        case "default":
+            return DefaultImporter
+        case "noop":
+            return NoopImporter
+        case "ropecon2024":
+            return RopeconImporter
+        case "tracon2024":
+            return TraconImporter
+        case "hitpoint2024":
+            return HitpointImporter
+        case unimplemented_importer_name:
+            raise NotImplementedError(unimplemented_importer_name)
+
+
 @dataclass
 class ProgramV2ProfileMeta:
     """
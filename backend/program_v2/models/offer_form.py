@@ -5,7 +5,6 @@ from django.utils.translation import gettext_lazy as _
 from core.models import Event
 from core.utils import NONUNIQUE_SLUG_FIELD_PARAMS, is_within_period
 from forms.models.form import Form
-from graphql_api.language import SUPPORTED_LANGUAGES
 
 
 class OfferForm(models.Model):
@@ -49,22 +48,10 @@ class OfferForm(models.Model):
         return is_within_period(self.active_from, self.active_until)
 
     def get_form(self, requested_language: str) -> Form:
-        try:
-            return self.languages.get(language=requested_language)
-        except Form.DoesNotExist:
-            pass
+        if (form := Form.get_language_version(self.languages.all(), requested_language)) is None:
+            raise Form.DoesNotExist()
 
-        for language in SUPPORTED_LANGUAGES:
-            if language.code == requested_language:
-                # already tried above, skip one extra query
-                continue
-
-            try:
-                return self.languages.get(language=language.code)
-            except Form.DoesNotExist:
-                pass
-
-        raise Form.DoesNotExist()
+        return form
 
     class Meta:
         unique_together = [
@@ -1,12 +1,14 @@
 from __future__ import annotations
 
 import logging
+from collections.abc import Iterable
 from datetime import tzinfo
 from functools import cached_property
 from typing import TYPE_CHECKING, Self
 
 from django.conf import settings
 from django.db import models, transaction
+from django.db.models import Max, Min, Prefetch
 from django.http import HttpRequest
 from django.urls import reverse
 from django.utils.timezone import now
@@ -17,7 +19,7 @@ from core.utils import validate_slug
 if TYPE_CHECKING:
     from programme.models.programme import Programme
 
-    from .dimension import ProgramDimensionValue
+    from .dimension import Dimension, ProgramDimensionValue
     from .meta import ProgramV2EventMeta
     from .schedule import ScheduleItem
 
@@ -83,22 +85,25 @@ class Program(models.Model):
         cls.refresh_cached_dimensions_qs(queryset)
         cls.refresh_cached_times_qs(queryset)
 
-    def _build_dimensions(self):
+    def _build_dimensions(self, pdvs: Iterable[ProgramDimensionValue], event_dimensions: Iterable[Dimension]):
         """
         Used to populate cached_dimensions
         """
         # TODO should all event dimensions always be present, or only those with values?
         # TODO when dimensions are changed for an event, refresh all cached_dimensions
-        dimensions = {dimension.slug: [] for dimension in self.event.program_dimensions.all()}
-        for pdv in self.dimensions.all():
+        dimensions = {dimension.slug: [] for dimension in event_dimensions}
+        for pdv in pdvs:
             dimensions[pdv.dimension.slug].append(pdv.value.slug)
         return dimensions
 
-    def _build_location(self):
+    def _build_location(self, pdvs: Iterable[ProgramDimensionValue], location_dimension_id: int | None):
         localized_locations: dict[str, set[str]] = {}
 
-        if location_dimension := self.meta.location_dimension:
-            for pdv in self.dimensions.filter(dimension=location_dimension):
+        if location_dimension_id:
+            for pdv in pdvs:
+                if pdv.dimension_id != location_dimension_id:
+                    continue
+
                 for lang, title in pdv.value.title.items():
                     if not title:
                         # placate typechecker
@@ -115,47 +120,61 @@ class Program(models.Model):
 
         return {lang: ", ".join(locations) for lang, locations in localized_locations.items() if locations}
 
-    def _get_color(self):
+    def _get_color(self, pdvs: Iterable[ProgramDimensionValue]):
         """
         Gets a color for the program from its dimension values.
         TODO deterministic behaviour when multiple colors are present (ordering for dimensions/values?)
         """
-        first_pdv_with_color = self.dimensions.exclude(value__color="").first()
-        return first_pdv_with_color.value.color if first_pdv_with_color else ""
+        return next((pdv.value.color for pdv in pdvs if pdv.value.color), "")
 
     def refresh_cached_dimensions(self):
-        from .schedule import ScheduleItem
-
-        self.cached_dimensions = self._build_dimensions()
-        self.cached_location = self._build_location()
-        self.cached_color = self._get_color()
+        pdvs = list(self.dimensions.select_related("dimension", "value"))
+        self.cached_dimensions = self._build_dimensions(pdvs, self.event.program_dimensions.all())
+        self.cached_location = self._build_location(pdvs, self.meta.location_dimension_id)
+        self.cached_color = self._get_color(pdvs)
         self.save(update_fields=["cached_dimensions", "cached_location", "cached_color", "updated_at"])
         self.schedule_items.update(cached_location=self.cached_location)
 
-        bulk_update_schedule_items = []
-        for schedule_item in self.schedule_items.filter(program=self).select_for_update(of=("self",)):
-            schedule_item.cached_location = self.cached_location
-            bulk_update_schedule_items.append(schedule_item)
-        ScheduleItem.objects.bulk_update(bulk_update_schedule_items, ["cached_location"])
-
     program_batch_size = 100
     schedule_item_batch_size = 100
 
     @classmethod
     def refresh_cached_dimensions_qs(cls, queryset: models.QuerySet[Self]):
+        from .dimension import ProgramDimensionValue
         from .schedule import ScheduleItem
 
         with transaction.atomic():
+            # event dimensions and location dimension are resolved once per event, not once per program
+            event_cache: dict[int, tuple[list[Dimension], int | None]] = {}
             bulk_update_programs = []
-            for program in queryset.select_for_update(of=("self",)).only(
-                "id",
-                "cached_dimensions",
-                "cached_location",
-                "cached_color",
+            for program in (
+                queryset.select_for_update(of=("self",))
+                .only(
+                    "id",
+                    "event",
+                    "cached_dimensions",
+                    "cached_location",
+                    "cached_color",
+                )
+                .prefetch_related(
+                    Prefetch(
+                        "dimensions",
+                        queryset=ProgramDimensionValue.objects.select_related("dimension", "value"),
+                    ),
+                    "event__program_dimensions",
+                )
             ):
-                program.cached_dimensions = program._build_dimensions()
-                program.cached_location = program._build_location()
-                program.cached_color = program._get_color()
+                if (event_data := event_cache.get(program.event_id)) is None:
+                    event_data = event_cache[program.event_id] = (
+                        list(program.event.program_dimensions.all()),
+                        program.meta.location_dimension_id,
+                    )
+                event_dimensions, location_dimension_id = event_data
+
+                pdvs = program.dimensions.all()
+                program.cached_dimensions = program._build_dimensions(pdvs, event_dimensions)
+                program.cached_location = program._build_location(pdvs, location_dimension_id)
+                program.cached_color = program._get_color(pdvs)
                 bulk_update_programs.append(program)
             num_programs_updated = cls.objects.bulk_update(
                 bulk_update_programs,
@@ -164,14 +183,14 @@ class Program(models.Model):
             )
             logger.info("Refreshed cached dimensions for %s programs", num_programs_updated)
 
+            cached_location_by_program_id = {program.id: program.cached_location for program in bulk_update_programs}
             bulk_update_schedule_items = []
             for schedule_item in (
-                ScheduleItem.objects.filter(program__in=queryset)
+                ScheduleItem.objects.filter(program_id__in=list(cached_location_by_program_id))
                 .select_for_update(of=("self",))
-                .select_related("program")
-                .only("program__cached_location")
+                .only("id", "program")
             ):
-                schedule_item.cached_location = schedule_item.program.cached_location
+                schedule_item.cached_location = cached_location_by_program_id[schedule_item.program_id]
                 bulk_update_schedule_items.append(schedule_item)
             num_schedule_items_updated = ScheduleItem.objects.bulk_update(
                 bulk_update_schedule_items,
@@ -184,32 +203,46 @@ class Program(models.Model):
         """
         Used to populate cached_earliest_start_time and cached_latest_end_time
         """
-        earliest_start_time = self.schedule_items.order_by("start_time").first()
-        latest_end_time = self.schedule_items.order_by("cached_end_time").last()
+        times = self.schedule_items.aggregate(
+            earliest_start_time=Min("start_time"),
+            latest_end_time=Max("cached_end_time"),
+        )
 
-        self.cached_earliest_start_time = earliest_start_time.start_time if earliest_start_time else None
-        self.cached_latest_end_time = latest_end_time.cached_end_time if latest_end_time else None
+        self.cached_earliest_start_time = times["earliest_start_time"]
+        self.cached_latest_end_time = times["latest_end_time"]
 
         self.save(update_fields=["cached_earliest_start_time", "cached_latest_end_time", "updated_at"])
 
     @classmethod
     def refresh_cached_times_qs(cls, queryset: models.QuerySet[Self]):
-        with transaction.atomic():
-            bulk_update = []
-            for program in queryset.select_for_update(of=("self",)).only(
-                "id",
-                "cached_earliest_start_time",
-                "cached_latest_end_time",
-            ):
-                earliest_start_time = program.schedule_items.order_by("start_time").first()
-                latest_end_time = program.schedule_items.order_by("cached_end_time").last()
+        from .schedule import ScheduleItem
 
-                program.cached_earliest_start_time = earliest_start_time.start_time if earliest_start_time else None
-                program.cached_latest_end_time = latest_end_time.cached_end_time if latest_end_time else None
+        with transaction.atomic():
+            programs = list(
+                queryset.select_for_update(of=("self",)).only(
+                    "id",
+                    "cached_earliest_start_time",
+                    "cached_latest_end_time",
+                )
+            )
+            times_by_program_id = {
+                row["program_id"]: (row["earliest_start_time"], row["latest_end_time"])
+                for row in ScheduleItem.objects.filter(program__in=queryset)
+                .values("program_id")
+                .annotate(
+                    earliest_start_time=Min("start_time"),
+                    latest_end_time=Max("cached_end_time"),
+                )
+            }
+
+            for program in programs:
+                (
+                    program.cached_earliest_start_time,
+                    program.cached_latest_end_time,
+                ) = times_by_program_id.get(program.id, (None, None))
 
-                bulk_update.append(program)
             num_updated = cls.objects.bulk_update(
-                bulk_update,
+                programs,
                 ["cached_earliest_start_time", "cached_latest_end_time"],
                 batch_size=cls.program_batch_size,
             )
@@ -1,10 +1,13 @@
 from datetime import UTC, datetime, timedelta
 
 import pytest
+from django.contrib.auth.models import Group
 
 from core.models.event import Event
 
 from .filters import ProgramFilters
+from .models.dimension import DimensionDTO, DimensionValueDTO, ProgramDimensionValue
+from .models.meta import ProgramV2EventMeta
 from .models.program import Program
 from .models.schedule import ScheduleItem
 
@@ -30,3 +33,44 @@ def test_program_filters():
 
     assert updated_after_t1.filter_schedule_items(event.schedule_items.all()).count() == 1
     assert updated_after_t2.filter_schedule_items(event.schedule_items.all()).count() == 0
+
+
+@pytest.mark.django_db
+def test_refresh_cached_fields_qs():
+    event, _ = Event.get_or_create_dummy()
+    admin_group, _ = Group.objects.get_or_create(name="program-v2-test-admins")
+    (room_dimension,) = DimensionDTO.save_many(
+        event,
+        [
+            DimensionDTO(
+                slug="room",
+                title={"en": "Room"},
+                choices=[DimensionValueDTO(slug="main-hall", title={"en": "Main hall"}, color="red")],
+            ),
+        ],
+        refresh_cached=False,
+    )
+    ProgramV2EventMeta.objects.create(event=event, admin_group=admin_group, location_dimension=room_dimension)
+
+    program = Program(event=event, title="Program 1", slug="program-1")
+    program.save()
+    ProgramDimensionValue.bulk_upsert(
+        ProgramDimensionValue.build_upsertables(
+            program,
+            {"room": ["main-hall"]},
+            *ProgramDimensionValue.build_upsert_cache(event),
+        )
+    )
+
+    start_time = datetime.now(UTC)
+    ScheduleItem(program=program, start_time=start_time, length=timedelta(hours=1)).with_generated_fields().save()
+
+    Program.refresh_cached_fields_qs(event.programs.all())
+
+    program.refresh_from_db()
+    assert program.cached_dimensions == {"room": ["main-hall"]}
+    assert program.cached_location == {"en": "Main hall"}
+    assert program.cached_color == "red"
+    assert program.cached_earliest_start_time == start_time
+    assert program.cached_latest_end_time == start_time + timedelta(hours=1)
+    assert program.schedule_items.get().cached_location == {"en": "Main hall"}
@@ -14,7 +14,11 @@ from ..models import FreeformOrganizer, Invitation, ProgrammeRole
 @programme_event_required
 @person_required
 def accept_invitation_view(request, event, code):
-    invitation = get_object_or_404(Invitation, programme__category__event=event, code=code)
+    invitation = get_object_or_404(
+        Invitation.objects.select_related("programme__category__event", "programme__form_used", "role"),
+        programme__category__event=event,
+        code=code,
+    )
     programme = invitation.programme
 
     existing_role = ProgrammeRole.objects.filter(programme=programme, person=request.user.person).first()
@@ -97,8 +101,12 @@ def accept_invitation_view(request, event, code):
         host_can_invite_more=invitation.extra_invites > 0,
         num_extra_invites=invitation.extra_invites,
         invitation=invitation,
-        invitations=Invitation.objects.filter(programme=programme, state="valid").exclude(pk=invitation.pk),
-        programme_roles=ProgrammeRole.objects.filter(programme=programme),
+        invitations=(
+            Invitation.objects.filter(programme=programme, state="valid")
+            .exclude(pk=invitation.pk)
+            .select_related("role")
+        ),
+        programme_roles=ProgrammeRole.objects.filter(programme=programme).select_related("person", "role"),
         signup_extra_form=signup_extra_form,
         sired_invitation_formset=sired_invitation_formset,
     )
@@ -132,6 +132,7 @@ class TicketsEventMeta(ContactEmailMixin, EventMetaBase):
         if self.is_user_admin(user):
             return True
 
+        # cached on the user object, see GroupManagementMixin.is_user_in_group
         return self.pos_access_group and self.is_user_in_group(user, self.pos_access_group)
 
     class Meta: